@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+sift-exporter.py - Export sift database and activity stats as OpenMetrics
+
+Usage: python3 sift-exporter.py [--listen 127.0.0.1:9465] [ROOT ...]
+   or: python3 sift-exporter.py --textfile /var/lib/node_exporter/sift.prom [ROOT ...]
+
+Headless counterpart to `sift --monitor`. Discovers .sift/ directories
+under each ROOT (default: home directory) and exposes database sizes, row
+counts, PSI state, sift process RSS and per-tool latency histograms in
+Prometheus text format (or OpenMetrics, when the scraper asks for it).
+
+Latency comes from tool_call_log, which sift trims to its newest 1000 rows.
+Histograms are accumulated from it incrementally and persisted in
+~/.sift/exporter-state.json so counters stay monotonic across scrapes and
+exporter restarts. Row counts are cached and only recounted, at most every
+ROW_COUNT_SECONDS, for databases that changed since the last count.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+STATE_FILE = Path.home() / ".sift" / "exporter-state.json"
+DEFAULT_LISTEN = "127.0.0.1:9465"
+DEFAULT_MAX_DEPTH = 4
+REDISCOVER_SECONDS = 300
+ROW_COUNT_SECONDS = 300
+
+# Directories never worth descending into while looking for .sift/
+SKIP_DIRS = {".git", "node_modules", ".venv", "venv", "__pycache__", ".cache", "target", ".sift"}
+
+# Tables counted per database, matching the `sift --monitor` database panel
+DATABASES = {
+    "memory.db": [
+        "memories", "reflections", "access_patterns", "plan_decisions",
+        "memory_deps", "activity_log", "resource_events", "tool_call_log",
+    ],
+    "context.db": ["sessions", "messages", "tool_calls", "context_memory_links"],
+    "workspace.db": ["workspace_files", "workspace_lines"],
+}
+
+# Same thresholds as the binary (see docs/HARDWARE_AWARENESS.md)
+PSI_SOME_ELEVATED = 10.0
+PSI_FULL_CRITICAL = 1.0
+PSI_RESOURCES = ["cpu", "memory", "io"]
+PSI_STATES = ["normal", "elevated", "critical"]
+
+LATENCY_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+CONTENT_TYPE_TEXT = "text/plain; version=0.0.4; charset=utf-8"
+CONTENT_TYPE_OPENMETRICS = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class Metrics:
+    """Metric families in insertion order, rendered as Prometheus or OpenMetrics text."""
+
+    def __init__(self):
+        self.families = {}
+
+    def add(self, name: str, mtype: str, help_text: str, labels: dict, value: float,
+            suffix: str = "") -> None:
+        """Add one sample to family `name`; suffix is e.g. _bucket or _count."""
+        family = self.families.setdefault(name, {"type": mtype, "help": help_text, "samples": []})
+        family["samples"].append((suffix, labels, value))
+
+    def render(self, openmetrics: bool = False) -> str:
+        lines = []
+        for name, family in self.families.items():
+            mtype = family["type"]
+            # Prometheus 0.0.4 has no stateset
+            if not openmetrics and mtype == "stateset":
+                mtype = "gauge"
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {mtype}")
+            for suffix, labels, value in family["samples"]:
+                lines.append(f"{name}{suffix}{format_labels(labels)} {format_value(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels: dict) -> str:
+    """Format a label dict as {k="v",...}, escaping values."""
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def format_value(value: float) -> str:
+    """Format a sample value; integers without a trailing .0."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def discover(roots: list, max_depth: int) -> list:
+    """Find project directories containing a .sift/ directory under roots."""
+    projects = []
+    for root in roots:
+        root = os.path.abspath(os.path.expanduser(root))
+        base_depth = root.rstrip(os.sep).count(os.sep)
+        for dirpath, dirnames, _ in os.walk(root):
+            # ~/.sift holds global backups and has no databases of its own
+            sift_dir = os.path.join(dirpath, ".sift")
+            if ".sift" in dirnames and any(os.path.exists(os.path.join(sift_dir, db)) for db in DATABASES):
+                projects.append(dirpath)
+            if dirpath.count(os.sep) - base_depth >= max_depth:
+                dirnames[:] = []
+            else:
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+    return sorted(set(projects))
+
+
+def open_readonly(path: Path) -> sqlite3.Connection:
+    """Open a sqlite database read-only so the exporter never blocks sift writers."""
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True, timeout=1.0)
+    conn.execute("PRAGMA query_only = 1")
+    return conn
+
+
+def existing_tables(conn: sqlite3.Connection) -> set:
+    """Return the set of table names in a database."""
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def count_rows(conn: sqlite3.Connection, db_name: str, tables: set) -> dict:
+    """Count rows per table, plus memories by type for memory.db."""
+    counts = {"tables": {}, "memories": {}}
+    for table in DATABASES[db_name]:
+        if table in tables:
+            counts["tables"][table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    if db_name == "memory.db" and "memories" in tables:
+        for mtype, count in conn.execute("SELECT type, COUNT(*) FROM memories GROUP BY type"):
+            counts["memories"][mtype] = count
+    return counts
+
+
+def collect_database(metrics: Metrics, project: str, db_name: str, state: dict,
+                     row_cache: dict) -> None:
+    """Collect size, row counts and (for memory.db) tool latency for one database."""
+    path = Path(project) / ".sift" / db_name
+    labels = {"project": project, "db": db_name}
+
+    try:
+        if not path.exists():
+            return
+        wal = path.with_name(db_name + "-wal")
+        db_stat = path.stat()
+        wal_stat = wal.stat() if wal.exists() else None
+        metrics.add("sift_database_size_bytes", "gauge", "Database file size.",
+                    labels, db_stat.st_size)
+        metrics.add("sift_database_wal_size_bytes", "gauge", "Database write-ahead log size.",
+                    labels, wal_stat.st_size if wal_stat else 0)
+
+        conn = open_readonly(path)
+        try:
+            tables = existing_tables(conn)
+
+            # COUNT(*) scans whole tables; only recount changed databases, and not every scrape
+            signature = (db_stat.st_mtime_ns, wal_stat.st_mtime_ns if wal_stat else 0)
+            cached = row_cache.get((project, db_name))
+            now = time.monotonic()
+            if (cached is None
+                    or (cached["signature"] != signature and now - cached["counted_at"] >= ROW_COUNT_SECONDS)):
+                cached = {"signature": signature, "counted_at": now,
+                          "counts": count_rows(conn, db_name, tables)}
+                row_cache[(project, db_name)] = cached
+
+            if db_name == "memory.db" and "tool_call_log" in tables:
+                accumulate_latency(conn, state.setdefault(project, {}))
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error):
+        metrics.add("sift_database_up", "gauge", "Whether the database could be read.", labels, 0)
+        return
+
+    for table, count in cached["counts"]["tables"].items():
+        metrics.add("sift_database_rows", "gauge", "Row count per table.",
+                    dict(labels, table=table), count)
+    for mtype, count in cached["counts"]["memories"].items():
+        metrics.add("sift_memories", "gauge", "Memories by type.",
+                    {"project": project, "type": mtype}, count)
+    metrics.add("sift_database_up", "gauge", "Whether the database could be read.", labels, 1)
+
+
+def accumulate_latency(conn: sqlite3.Connection, project_state: dict) -> None:
+    """Fold tool_call_log rows newer than the last seen id into cumulative histograms.
+
+    Rows are folded into a local batch first and merged together with last_id
+    only once the whole read succeeded, so a failed read is retried next scrape
+    instead of being counted twice.
+    """
+    last_id = project_state.get("last_id", 0)
+    max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM tool_call_log").fetchone()[0]
+    if max_id < last_id:
+        # Log was recreated; ids restarted
+        last_id = 0
+
+    batch = {}
+    rows = conn.execute(
+        "SELECT id, tool_name, latency_ms FROM tool_call_log "
+        "WHERE id > ? AND latency_ms IS NOT NULL ORDER BY id", (last_id,))
+    for _, tool, latency_ms in rows:
+        # Skip rows a scrape cannot place: non-text tool names, non-numeric latencies
+        if not isinstance(tool, str) or not isinstance(latency_ms, (int, float)) or latency_ms < 0:
+            continue
+        hist = batch.setdefault(tool, {"buckets": [0] * len(LATENCY_BUCKETS), "count": 0, "sum": 0.0})
+        seconds = latency_ms / 1000.0
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                hist["buckets"][i] += 1
+        hist["count"] += 1
+        hist["sum"] += seconds
+
+    tools = project_state.setdefault("tools", {})
+    for tool, counted in batch.items():
+        hist = tools.setdefault(tool, {"buckets": [0] * len(LATENCY_BUCKETS), "count": 0, "sum": 0.0})
+        hist["buckets"] = [a + b for a, b in zip(hist["buckets"], counted["buckets"])]
+        hist["count"] += counted["count"]
+        hist["sum"] += counted["sum"]
+    project_state["last_id"] = max(last_id, max_id)
+
+
+def emit_latency(metrics: Metrics, state: dict, projects: list) -> None:
+    """Emit per-tool latency histograms from accumulated state; _count is the call counter."""
+    for project in projects:
+        for tool, hist in sorted(state.get(project, {}).get("tools", {}).items()):
+            labels = {"project": project, "tool": tool}
+            for bound, count in zip(LATENCY_BUCKETS, hist["buckets"]):
+                metrics.add("sift_tool_latency_seconds", "histogram", "Tool call latency.",
+                            dict(labels, le=repr(float(bound))), count, "_bucket")
+            metrics.add("sift_tool_latency_seconds", "histogram", "Tool call latency.",
+                        dict(labels, le="+Inf"), hist["count"], "_bucket")
+            metrics.add("sift_tool_latency_seconds", "histogram", "Tool call latency.",
+                        labels, hist["count"], "_count")
+            metrics.add("sift_tool_latency_seconds", "histogram", "Tool call latency.",
+                        labels, hist["sum"], "_sum")
+
+
+def read_psi(resource: str) -> dict:
+    """Read avg10 values from /proc/pressure/<resource>; empty if unavailable."""
+    values = {}
+    try:
+        with open(f"/proc/pressure/{resource}") as f:
+            for line in f:
+                fields = line.split()
+                for field in fields[1:]:
+                    key, _, value = field.partition("=")
+                    if key == "avg10":
+                        values[fields[0]] = float(value)
+    except (OSError, ValueError):
+        pass
+    return values
+
+
+def collect_system(metrics: Metrics) -> None:
+    """Collect PSI state, available memory and RSS of running sift processes."""
+    for resource in PSI_RESOURCES:
+        psi = read_psi(resource)
+        if not psi:
+            continue
+        for kind, value in psi.items():
+            metrics.add("sift_psi_avg10_ratio", "gauge", "PSI 10s average stall ratio.",
+                        {"resource": resource, "kind": kind}, value / 100.0)
+        if psi.get("full", 0.0) > PSI_FULL_CRITICAL:
+            current = "critical"
+        elif psi.get("some", 0.0) > PSI_SOME_ELEVATED:
+            current = "elevated"
+        else:
+            current = "normal"
+        for state in PSI_STATES:
+            metrics.add("sift_pressure_state", "stateset", "Pressure state as sift classifies it.",
+                        {"resource": resource, "sift_pressure_state": state}, int(state == current))
+
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    metrics.add("sift_memory_available_bytes", "gauge", "System available memory.",
+                                {}, int(line.split()[1]) * 1024)
+    except OSError:
+        pass
+
+    rss = 0
+    count = 0
+    for pid in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not pid.isdigit():
+            continue
+        try:
+            if Path(f"/proc/{pid}/comm").read_text().strip() != "sift":
+                continue
+            for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    rss += int(line.split()[1]) * 1024
+            count += 1
+        except (OSError, ValueError):
+            continue
+    metrics.add("sift_processes", "gauge", "Running sift processes.", {}, count)
+    metrics.add("sift_process_resident_memory_bytes", "gauge",
+                "Resident memory summed over running sift processes.", {}, rss)
+
+
+def load_state() -> dict:
+    """Load accumulated histogram state or return empty dict."""
+    if STATE_FILE.exists():
+        try:
+            return json.loads(STATE_FILE.read_text())
+        except json.JSONDecodeError:
+            return {}
+    return {}
+
+
+def save_state(state: dict) -> None:
+    """Save accumulated histogram state atomically."""
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    temp = STATE_FILE.with_suffix(".tmp")
+    temp.write_text(json.dumps(state))
+    temp.replace(STATE_FILE)
+
+
+class Exporter:
+    """Discovers projects and collects metrics; safe to call from server threads."""
+
+    def __init__(self, roots: list, max_depth: int):
+        self.roots = roots
+        self.max_depth = max_depth
+        self.projects = []
+        self.discovered_at = 0.0
+        self.state = load_state()
+        self.row_cache = {}
+        self.lock = threading.Lock()
+
+    def collect(self) -> Metrics:
+        with self.lock:
+            started = time.monotonic()
+            if started - self.discovered_at > REDISCOVER_SECONDS or not self.discovered_at:
+                self.projects = discover(self.roots, self.max_depth)
+                self.discovered_at = started
+
+            metrics = Metrics()
+            metrics.add("sift_projects", "gauge", "Discovered .sift directories.", {}, len(self.projects))
+            for project in self.projects:
+                for db_name in DATABASES:
+                    collect_database(metrics, project, db_name, self.state, self.row_cache)
+            emit_latency(metrics, self.state, self.projects)
+            collect_system(metrics)
+            try:
+                save_state(self.state)
+            except OSError as e:
+                print(f"Warning: could not save {STATE_FILE}: {e}", file=sys.stderr)
+            metrics.add("sift_exporter_collect_seconds", "gauge", "Time spent collecting.",
+                        {}, round(time.monotonic() - started, 6))
+            return metrics
+
+
+def write_textfile(exporter: Exporter, path: Path) -> None:
+    """Write metrics atomically for the node_exporter textfile collector."""
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_text(exporter.collect().render())
+    temp.replace(path)
+
+
+def parse_listen(value: str) -> tuple:
+    """Parse --listen as host:port or [ipv6]:port into (host, port)."""
+    host, sep, port = value.rpartition(":")
+    if not sep or not port.isdigit() or not 0 < int(port) < 65536:
+        raise argparse.ArgumentTypeError(f"expected host:port or [ipv6]:port, got {value!r}")
+    if host.startswith("[") and host.endswith("]"):
+        host = host[1:-1]
+    return host or "127.0.0.1", int(port)
+
+
+def serve(exporter: Exporter, host: str, port: int) -> None:
+    """Serve /metrics over HTTP until interrupted."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+            body = exporter.collect().render(openmetrics).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE_OPENMETRICS if openmetrics else CONTENT_TYPE_TEXT)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        address_family = socket.AF_INET6 if ":" in host else socket.AF_INET
+
+    try:
+        server = Server((host, port), Handler)
+    except OSError as e:
+        print(f"Error: cannot listen on {host}:{port}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    display_host = f"[{host}]" if ":" in host else host
+    print(f"Serving sift metrics on http://{display_host}:{port}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export sift stats in Prometheus/OpenMetrics format")
+    parser.add_argument("roots", nargs="*", default=[str(Path.home())],
+                        help="directories to search for .sift/ (default: home directory)")
+    parser.add_argument("--listen", type=parse_listen, default=DEFAULT_LISTEN,
+                        help=f"HTTP address to serve /metrics on (default: {DEFAULT_LISTEN})")
+    parser.add_argument("--textfile", type=Path,
+                        help="write metrics to this file instead of serving HTTP")
+    parser.add_argument("--interval", type=int, default=0,
+                        help="with --textfile, rewrite every N seconds instead of once")
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_MAX_DEPTH,
+                        help=f"directory depth searched below each root (default: {DEFAULT_MAX_DEPTH})")
+    args = parser.parse_args()
+
+    exporter = Exporter(args.roots, args.max_depth)
+
+    if not args.textfile:
+        serve(exporter, *args.listen)
+        return
+
+    try:
+        while True:
+            try:
+                write_textfile(exporter, args.textfile)
+            except OSError as e:
+                print(f"Error writing {args.textfile}: {e}", file=sys.stderr)
+                # One-shot runs report failure; interval runs retry on the next tick
+                if args.interval <= 0:
+                    sys.exit(1)
+            if args.interval <= 0:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
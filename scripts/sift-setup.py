@@ -59,9 +59,10 @@ INPUT=$(cat)
 TRANSCRIPT=$(echo "$INPUT" | jq -r '.transcript_path // empty')
 SESSION_ID=$(echo "$INPUT" | jq -r '.session_id // empty')
 if [[ -n "$TRANSCRIPT" && -f "$TRANSCRIPT" ]]; then
-  sift --context-sync "$TRANSCRIPT" 2>/dev/null || true
-fi
-if [[ -n "$SESSION_ID" ]]; then
+  # Deferred as one unit so the session is never marked ended before its sync
+  "$(dirname "$0")/sift-pressure.sh" session-end sh -c \
+    'sift --context-sync "$1"; [ -z "$2" ] || sift --session-end "$2"' _ "$TRANSCRIPT" "$SESSION_ID" 2>/dev/null || true
+elif [[ -n "$SESSION_ID" ]]; then
   sift --session-end "$SESSION_ID" 2>/dev/null || true
 fi
 ''',
@@ -70,11 +71,163 @@ fi
 INPUT=$(cat)
 TRANSCRIPT=$(echo "$INPUT" | jq -r '.transcript_path // empty')
 if [[ -n "$TRANSCRIPT" && -f "$TRANSCRIPT" ]]; then
-  sift --context-sync "$TRANSCRIPT" 2>/dev/null || true
+  "$(dirname "$0")/sift-pressure.sh" context-sync sift --context-sync "$TRANSCRIPT" 2>/dev/null || true
 fi
 ''',
+    "sift-pressure.sh": r'''#!/bin/bash
+# sift-pressure.sh - Schedule heavy hook work according to system pressure
+#
+# Usage: sift-pressure.sh <label> <command> [args...]
+#
+# Reads /proc/pressure/{cpu,memory,io} and applies the same PSI thresholds
+# as the sift binary (some avg10 > 10.0 elevated, full avg10 > 1.0 critical):
+#   NORMAL    run now
+#   ELEVATED  run now at idle I/O class and lowest CPU priority
+#   CRITICAL  defer: queue the command until a hook runs below CRITICAL
+# Below CRITICAL, previously deferred work is drained in the background at
+# low priority; pressure is re-checked before each entry and the rest stays
+# queued if it turns CRITICAL. To flush the queue by hand regardless of
+# pressure: sift-pressure.sh --drain
+# Queued commands are de-duplicated per directory, so repeated deferrals of
+# the same work are batched into one run. Every decision is logged to
+# ~/.sift/hooks.log. Thresholds: SIFT_PSI_SOME, SIFT_PSI_FULL.
+
+LABEL="$1"
+shift
+[[ -z "$LABEL" || ( $# -eq 0 && "$LABEL" != --drain ) ]] && { echo "usage: $0 <label> <command> [args...]" >&2; exit 2; }
+
+STATE_DIR="$HOME/.sift"
+QUEUE="$STATE_DIR/deferred-hooks"
+LOG="$STATE_DIR/hooks.log"
+SOME_LIMIT="${SIFT_PSI_SOME:-10.0}"
+FULL_LIMIT="${SIFT_PSI_FULL:-1.0}"
+mkdir -p "$STATE_DIR"
+
+# psi <resource> <some|full> - print avg10, or 0.00 when PSI is unavailable
+psi() {
+  local file="/proc/pressure/$1"
+  [[ -r "$file" ]] || { echo "0.00"; return; }
+  awk -v kind="$2" '$1 == kind { sub("avg10=", "", $2); v = $2 } END { print (v == "" ? "0.00" : v) }' "$file"
 }
 
+exceeds() { awk -v a="$1" -v b="$2" 'BEGIN { exit !(a > b) }'; }
+
+log() {
+  if [[ -f "$LOG" && $(wc -c < "$LOG") -gt 1048576 ]]; then
+    mv -f "$LOG" "$LOG.1"
+  fi
+  printf '%s %-8s %-6s %-14s %s %s\n' "$(date '+%Y-%m-%dT%H:%M:%S')" "$STATE" "$1" "$2" "$PSI" "$3" >> "$LOG"
+}
+
+# lowprio <command...> - run at idle I/O class and nice 19 where supported
+lowprio() {
+  if command -v ionice >/dev/null 2>&1; then
+    nice -n 19 ionice -c 3 "$@"
+  else
+    nice -n 19 "$@"
+  fi
+}
+
+# classify - set STATE and PSI from current pressure
+classify() {
+  local res some full
+  STATE=NORMAL
+  PSI=""
+  for res in cpu memory io; do
+    some=$(psi "$res" some)
+    full=$(psi "$res" full)
+    PSI+="$res=$some/$full "
+    if exceeds "$full" "$FULL_LIMIT"; then
+      STATE=CRITICAL
+    elif exceeds "$some" "$SOME_LIMIT" && [[ "$STATE" == NORMAL ]]; then
+      STATE=ELEVATED
+    fi
+  done
+  PSI="${PSI% }"
+}
+
+# enqueue <entry> - append unless already queued
+enqueue() {
+  if [[ -f "$QUEUE" ]] && grep -qxF "$1" "$QUEUE"; then
+    return 1
+  fi
+  printf '%s\n' "$1" >> "$QUEUE"
+}
+
+# drain [--force] - run queued entries, stopping if pressure turns CRITICAL
+drain() {
+  local batch="$QUEUE.$$" line dir label cmd
+  mv "$QUEUE" "$batch" 2>/dev/null || return 0
+  while IFS= read -r line; do
+    if [[ "$1" != --force ]]; then
+      classify
+      if [[ "$STATE" == CRITICAL ]]; then
+        # Put this and every remaining entry back for a later run
+        { printf '%s\n' "$line"; cat; } | while IFS= read -r rest; do
+          IFS=$'\t' read -r dir label cmd <<< "$rest"
+          enqueue "$rest" && log requeue "$label" "$dir"
+        done
+        break
+      fi
+    fi
+    IFS=$'\t' read -r dir label cmd <<< "$line"
+    log drain "$label" "$dir"
+    (cd "$dir" 2>/dev/null && eval "lowprio $cmd") </dev/null >/dev/null 2>&1
+  done < "$batch"
+  rm -f "$batch"
+}
+
+if [[ "$LABEL" == --drain ]]; then
+  STATE=MANUAL
+  PSI=""
+  drain --force
+  exit 0
+fi
+
+classify
+
+case "$STATE" in
+  CRITICAL)
+    printf -v cmd '%q ' "$@"
+    entry="$PWD"$'\t'"$LABEL"$'\t'"${cmd% }"
+    if enqueue "$entry"; then
+      log defer "$LABEL" "$PWD"
+    else
+      log batch "$LABEL" "$PWD"
+    fi
+    ;;
+  *)
+    if [[ "$STATE" == ELEVATED ]]; then
+      log nice "$LABEL" "$PWD"
+      lowprio "$@"
+    else
+      log run "$LABEL" "$PWD"
+      "$@"
+    fi
+    status=$?
+    if [[ -s "$QUEUE" ]]; then
+      drain </dev/null >/dev/null 2>&1 &
+      disown
+    fi
+    exit $status
+    ;;
+esac
+''',
+}
+
+# SessionStart index refresh, routed through the pressure-aware scheduler
+QUARRY_HOOK = (
+    "~/.claude/hooks/sift-pressure.sh quarry-refresh sh -c "
+    "'sift --quarry refresh 2>/dev/null || sift --quarry init 2>/dev/null' 2>/dev/null || true"
+)
+
+# Earlier forms of QUARRY_HOOK, upgraded in place by step 4
+LEGACY_QUARRY_HOOKS = [
+    "sift --quarry refresh 2>/dev/null || sift --quarry init 2>/dev/null || true",
+    "~/.claude/hooks/sift-pressure.sh quarry-refresh sh -c "
+    "'sift --quarry refresh 2>/dev/null || sift --quarry init 2>/dev/null' || true",
+]
+
 
 def prompt(question: str, default: str = "y") -> bool:
     """Prompt user for yes/no answer. Reads from /dev/tty for piped scripts."""
@@ -185,6 +338,54 @@ def add_hook(settings: dict, hook_type: str, commands: list) -> bool:
     return True
 
 
+def replace_hook_command(settings: dict, hook_type: str, old: str, new: str) -> bool:
+    """Replace an exact hook command in place. Returns True if one was found."""
+    replaced = False
+    for hook_group in settings.get("hooks", {}).get(hook_type, []):
+        for hook in hook_group.get("hooks", []):
+            if hook.get("command") == old:
+                hook["command"] = new
+                replaced = True
+    return replaced
+
+
+def upgrade_quarry_hook(settings: dict) -> bool:
+    """Replace any earlier SessionStart index refresh command with QUARRY_HOOK."""
+    upgraded = False
+    for legacy in LEGACY_QUARRY_HOOKS:
+        if replace_hook_command(settings, "SessionStart", legacy, QUARRY_HOOK):
+            upgraded = True
+    return upgraded
+
+
+def has_hook_command(settings: dict, hook_type: str, command: str) -> bool:
+    """Check if a hook with exactly this command exists."""
+    for hook_group in settings.get("hooks", {}).get(hook_type, []):
+        for hook in hook_group.get("hooks", []):
+            if hook.get("command") == command:
+                return True
+    return False
+
+
+def hook_scripts_outdated(hooks_dir: Path) -> bool:
+    """Check if any installed hook script is missing or differs from HOOK_SCRIPTS."""
+    for name, content in HOOK_SCRIPTS.items():
+        script_path = hooks_dir / name
+        if not script_path.exists() or script_path.read_text() != content:
+            return True
+    return False
+
+
+def install_hook_scripts(hooks_dir: Path) -> None:
+    """Write HOOK_SCRIPTS into hooks_dir and make them executable."""
+    hooks_dir.mkdir(parents=True, exist_ok=True)
+    for name, content in HOOK_SCRIPTS.items():
+        script_path = hooks_dir / name
+        script_path.write_text(content)
+        script_path.chmod(0o755)
+        print(f"  ✓ Installed {script_path}")
+
+
 def main():
     print("Sift Installer")
     print("==============")
@@ -244,12 +445,13 @@ def main():
             except Exception:
                 pass
             
-            # Also install uninstall script
-            print("  Downloading uninstall script...")
-            uninstall_dest = INSTALL_DIR / "sift-uninstall.py"
-            if download_file(f"{release_url}/sift-uninstall.py", uninstall_dest):
-                uninstall_dest.chmod(0o755)
-                print(f"  ✓ Installed {uninstall_dest}")
+            # Also install uninstall and metrics exporter scripts
+            for script in ["sift-uninstall.py", "sift-exporter.py"]:
+                print(f"  Downloading {script}...")
+                script_dest = INSTALL_DIR / script
+                if download_file(f"{release_url}/{script}", script_dest):
+                    script_dest.chmod(0o755)
+                    print(f"  ✓ Installed {script_dest}")
             
             # Check PATH
             if not shutil.which("sift"):
@@ -338,13 +540,31 @@ def main():
         else:
             missing.append(hook_type)
     
-    if not missing:
+    hooks_dir = CLAUDE_DIR / "hooks"
+    outdated = (hook_scripts_outdated(hooks_dir)
+                or any(has_hook_command(settings, "SessionStart", legacy)
+                       for legacy in LEGACY_QUARRY_HOOKS))
+    
+    if not missing and not outdated:
         # All hooks configured
         print(f"  ✓ All sift hooks configured: {', '.join(existing)}")
+    elif not missing:
+        # Hooks from an older install: refresh scripts for pressure-aware scheduling
+        print("  Installed hooks are out of date")
+        print("  (heavy work is deferred or deprioritized under CPU/memory/I/O pressure)")
+        
+        if prompt("  Update hooks?"):
+            install_hook_scripts(hooks_dir)
+            if upgrade_quarry_hook(settings):
+                save_settings(settings)
+                print("  ✓ Updated SessionStart index refresh")
+        else:
+            print("  Skipped.")
     else:
         print("  SessionStart: inject memory context, refresh workspace index")
         print("  SessionEnd: mark session as ended for consolidation tracking")
         print("  PreCompact: save transcript to context.db before compaction")
+        print("  Heavy work is deferred or deprioritized under system pressure")
         print()
         
         if existing:
@@ -353,14 +573,7 @@ def main():
         
         if prompt("  Configure hooks?"):
             # Install hook scripts
-            hooks_dir = CLAUDE_DIR / "hooks"
-            hooks_dir.mkdir(parents=True, exist_ok=True)
-            
-            for name, content in HOOK_SCRIPTS.items():
-                script_path = hooks_dir / name
-                script_path.write_text(content)
-                script_path.chmod(0o755)
-                print(f"  ✓ Installed {script_path}")
+            install_hook_scripts(hooks_dir)
             
             # Update settings.json
             added = []
@@ -368,7 +581,7 @@ def main():
             if add_hook(settings, "SessionStart", [
                 "~/.claude/hooks/session-start.sh",
                 "sift --session-context 2>/dev/null || true",
-                "sift --quarry refresh 2>/dev/null || sift --quarry init 2>/dev/null || true",
+                QUARRY_HOOK,
             ]):
                 added.append("SessionStart")
             
@@ -378,9 +591,15 @@ def main():
             if add_hook(settings, "PreCompact", ["~/.claude/hooks/pre-compact.sh"]):
                 added.append("PreCompact")
             
-            if added:
+            # An existing SessionStart group may still carry the unscheduled refresh
+            upgraded = upgrade_quarry_hook(settings)
+            
+            if added or upgraded:
                 save_settings(settings)
+            if added:
                 print(f"  ✓ Added hooks: {', '.join(added)}")
+            if upgraded:
+                print("  ✓ Updated SessionStart index refresh")
         else:
             print("  Skipped.")
     print()
@@ -39,10 +39,23 @@ TEMPLATES = [
     "CONTEXT_TOOLS.md",
 ]
 
+# Tool state in ~/.sift/ written by the hooks and the metrics exporter
+STATE_DIR = Path.home() / ".sift"
+STATE_FILES = [
+    "hooks.log",
+    "hooks.log.1",
+    "deferred-hooks",
+    "exporter-state.json",
+]
+
+# Queue of hook work deferred under pressure, plus in-flight drain batches
+DEFERRED_QUEUE = STATE_DIR / "deferred-hooks"
+
 HOOK_SCRIPTS = [
     "session-start.sh",
     "session-end.sh",
     "pre-compact.sh",
+    "sift-pressure.sh",
 ]
 
 
@@ -124,19 +137,37 @@ def remove_sift_section(filepath: Path) -> bool:
     return removed
 
 
+def deferred_files() -> list:
+    """Return the deferred hook queue and any in-flight drain batch files."""
+    return sorted(STATE_DIR.glob(DEFERRED_QUEUE.name + "*"))
+
+
+def count_deferred() -> int:
+    """Count deferred hook commands not yet run."""
+    total = 0
+    for path in deferred_files():
+        try:
+            total += sum(1 for line in path.read_text().splitlines() if line.strip())
+        except OSError:
+            pass
+    return total
+
+
 def main():
     print("Sift Uninstaller")
     print("================")
     print()
     print("This will remove:")
-    print("  - Sift binary from ~/.local/bin/")
+    print("  - Sift binary and scripts from ~/.local/bin/")
     print("  - Sift templates from ~/.claude/")
     print("  - Sift hooks from ~/.claude/hooks/")
     print("  - Sift hook configurations from settings.json")
     print("  - Sift MCP server registration")
+    print("  - Hook and exporter state from ~/.sift/ (logs, deferred queue)")
     print()
     print("This will NOT remove:")
     print("  - .sift/ directories (your project data)")
+    print("  - ~/.sift/backups/ (memory database backups)")
     print()
     
     if not prompt("Proceed with uninstall?"):
@@ -145,8 +176,33 @@ def main():
     
     print()
     
-    # Step 1: Remove binary
-    print("Step 1: Remove binary")
+    # Step 1: Flush deferred hook work
+    print("Step 1: Flush deferred hook work")
+    print("--------------------------------")
+    
+    pending = count_deferred()
+    pressure_script = CLAUDE_DIR / "hooks" / "sift-pressure.sh"
+    if not pending:
+        print("  No deferred hook work")
+    elif pressure_script.exists() and (INSTALL_DIR / "sift").exists():
+        print(f"  {pending} deferred hook command(s) pending (transcript syncs, index refreshes)")
+        if prompt("  Run them now, before sift is removed?"):
+            result = subprocess.run(
+                [str(pressure_script), "--drain"],
+                env=dict(os.environ, PATH=f"{INSTALL_DIR}{os.pathsep}{os.environ.get('PATH', '')}"),
+            )
+            if result.returncode == 0:
+                print("  ✓ Ran deferred hook work")
+            else:
+                print(f"  Warning: drain exited with status {result.returncode}")
+        else:
+            print(f"  Discarding {pending} deferred command(s)")
+    else:
+        print(f"  Warning: discarding {pending} deferred hook command(s); sift is no longer installed to run them")
+    print()
+    
+    # Step 2: Remove binary
+    print("Step 2: Remove binary")
     print("---------------------")
     
     binary = INSTALL_DIR / "sift"
@@ -156,16 +212,16 @@ def main():
     else:
         print(f"  Binary not found at {binary}")
     
-    # Remove uninstall scripts
-    for script in ["sift-uninstall.sh", "sift-uninstall.py"]:
+    # Remove uninstall and exporter scripts
+    for script in ["sift-uninstall.sh", "sift-uninstall.py", "sift-exporter.py"]:
         script_path = INSTALL_DIR / script
         if script_path.exists():
             script_path.unlink()
             print(f"  ✓ Removed {script_path}")
     print()
     
-    # Step 2: Remove templates
-    print("Step 2: Remove templates")
+    # Step 3: Remove templates
+    print("Step 3: Remove templates")
     print("------------------------")
     
     for template in TEMPLATES:
@@ -183,8 +239,8 @@ def main():
             print(f"  No sift section found in {claude_md}")
     print()
     
-    # Step 3: Remove hook scripts
-    print("Step 3: Remove hook scripts")
+    # Step 4: Remove hook scripts
+    print("Step 4: Remove hook scripts")
     print("---------------------------")
     
     hooks_dir = CLAUDE_DIR / "hooks"
@@ -193,10 +249,16 @@ def main():
         if hook_path.exists():
             hook_path.unlink()
             print(f"  ✓ Removed {hook_path}")
+    
+    state_paths = [STATE_DIR / name for name in STATE_FILES] + deferred_files()
+    for state_path in sorted(set(state_paths)):
+        if state_path.exists():
+            state_path.unlink()
+            print(f"  ✓ Removed {state_path}")
     print()
     
-    # Step 4: Remove hook configurations
-    print("Step 4: Remove hook configurations")
+    # Step 5: Remove hook configurations
+    print("Step 5: Remove hook configurations")
     print("----------------------------------")
     
     if SETTINGS_FILE.exists():
@@ -218,8 +280,8 @@ def main():
         print("  No settings.json found")
     print()
     
-    # Step 5: Restore TodoWrite
-    print("Step 5: Restore TodoWrite")
+    # Step 6: Restore TodoWrite
+    print("Step 6: Restore TodoWrite")
     print("-------------------------")
     
     if SETTINGS_FILE.exists():
@@ -241,8 +303,8 @@ def main():
         print("  No settings.json found")
     print()
     
-    # Step 6: Unregister MCP server
-    print("Step 6: Unregister MCP server")
+    # Step 7: Unregister MCP server
+    print("Step 7: Unregister MCP server")
     print("-----------------------------")
     
     try: